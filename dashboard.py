@@ -1,15 +1,17 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from statcast_parquet import read_parquet_copy, write_parquet_copy
 
 try:
-    import plotly.graph_objects as go
+    import plotly.express as px
 except ImportError as e:
     st.error(f"Error importing plotly: {e}. Attempting to resolve...")
     import sys
+    from importlib import metadata
     st.write("Python path:", sys.path)
     st.write("Installed packages:")
-    import pkg_resources
-    st.write([f"{pkg.key} {pkg.version}" for pkg in pkg_resources.working_set])
+    st.write(sorted(f"{dist.metadata['Name']} {dist.version}" for dist in metadata.distributions()))
     raise
 
 # Set page config
@@ -23,20 +25,121 @@ st.set_page_config(
 st.title("Arizona Diamondbacks Pitching Analysis")
 st.markdown("Analysis of pitch types and patterns across the D-backs pitching staff.")
 
+def category_equals(column, value):
+    """Compare a categorical column against a single value using its integer codes."""
+    categories = column.cat.categories
+    if value not in categories:
+        return np.zeros(len(column), dtype=bool)
+    return column.cat.codes.to_numpy() == categories.get_loc(value)
+
+# Statcast export and its Parquet copy, which loads much faster on a cold cache
+STATCAST_CSV = 'dbacks_team_statcast.csv'
+STATCAST_PARQUET = 'dbacks_team_statcast.parquet'
+
+# Columns the dashboard uses
+USED_COLUMNS = ['game_date', 'game_pk', 'player_name', 'pitch_name', 'home_team',
+                'away_team', 'inning_topbot', 'inning', 'release_speed']
+
 # Load the data
 @st.cache_data
 def load_data():
-    print("Loading data from dbacks_team_statcast.csv...")
-    return pd.read_csv('dbacks_team_statcast.csv')
+    # Prefer the Parquet copy unless the CSV has been updated since it was written
+    data = read_parquet_copy(STATCAST_CSV, STATCAST_PARQUET, columns=USED_COLUMNS)
+    if data is not None:
+        print(f"Loaded data from {STATCAST_PARQUET}")
+    else:
+        print(f"Loading data from {STATCAST_CSV}...")
+        data = pd.read_csv(
+            STATCAST_CSV,
+            engine='pyarrow',
+            parse_dates=['game_date'],
+            dtype={
+                'player_name': 'category',
+                'pitch_name': 'category',
+                'home_team': 'category',
+                'away_team': 'category',
+                'inning_topbot': 'category'
+            }
+        )
+        
+        write_parquet_copy(data, STATCAST_PARQUET)
+        data = data[USED_COLUMNS]
+    
+    # Sorted, ordered pitcher categories let the pitcher list come straight from the dtype
+    data['player_name'] = data['player_name'].cat.reorder_categories(
+        data['player_name'].cat.categories.sort_values(), ordered=True
+    )
+    
+    # Keep the rows in date order so date ranges can be sliced directly
+    data = data.sort_values('game_date', kind='stable').reset_index(drop=True)
+    
+    # Identify plays where the Diamondbacks were the pitching team. This never
+    # depends on the sidebar filters, so it is computed once with the cached data.
+    is_top = category_equals(data['inning_topbot'], 'Top')
+    is_bot = category_equals(data['inning_topbot'], 'Bot')
+    data['dbacks_pitching'] = (category_equals(data['home_team'], 'AZ') & is_top) | \
+                              (category_equals(data['away_team'], 'AZ') & is_bot)
+    
+    return data
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between keeps the
+    point forming the largest triangle with the previous pick and the average of
+    the next bucket, which preserves the visual shape of the line.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+# Cap on points sent to the browser for each time series trace
+MAX_POINTS_PER_TRACE = 500
+
+def filter_date_range(data, start_date, end_date):
+    """Return the rows of data whose game_date falls within [start_date, end_date].
+
+    data must be sorted by game_date, so the range is a contiguous slice found
+    by binary search rather than a boolean mask over every row.
+    """
+    lo = data['game_date'].searchsorted(pd.Timestamp(start_date))
+    hi = data['game_date'].searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1))
+    return data.iloc[lo:hi]
+
+@st.cache_data
+def load_pitcher_appearances():
+    """Starting and relief appearances per game and pitcher, built once per session."""
+    data = load_data()
+    dbacks_pitching_data = data[data['dbacks_pitching']]
+    
+    # Identify starting and relief appearances, keeping the game date with each
+    # one so the date filter can be applied later (rows stay in date order)
+    columns = ['game_pk', 'player_name', 'game_date']
+    first_inning_appearances = dbacks_pitching_data.loc[dbacks_pitching_data['inning'] == 1, columns].drop_duplicates(['game_pk', 'player_name'])
+    relief_appearances = dbacks_pitching_data.loc[dbacks_pitching_data['inning'] > 1, columns].drop_duplicates(['game_pk', 'player_name'])
+    
+    return first_inning_appearances, relief_appearances
 
 dbacks_data = load_data()
 
 # Process the data
-def process_pitching_data(data):
-    # Identify plays where the Diamondbacks were the pitching team
-    is_dbacks_pitching = ((data['home_team'] == 'AZ') & (data['inning_topbot'] == 'Top')) | \
-                        ((data['away_team'] == 'AZ') & (data['inning_topbot'] == 'Bot'))
-    dbacks_pitching_data = data[is_dbacks_pitching].copy()
+def process_pitching_data(data, start_date, end_date):
+    # Keep plays where the Diamondbacks were the pitching team
+    dbacks_pitching_data = data[data['dbacks_pitching']]
     
     # Get pitcher role selection from sidebar
     pitcher_role = st.sidebar.selectbox(
@@ -44,16 +147,18 @@ def process_pitching_data(data):
         ["Starters Only", "Relievers Only", "All Pitchers"]
     )
     
-    # Identify starting and relief appearances
-    first_inning_appearances = dbacks_pitching_data[dbacks_pitching_data['inning'] == 1].groupby(['game_pk', 'player_name']).first()
-    relief_appearances = dbacks_pitching_data[dbacks_pitching_data['inning'] > 1].groupby(['game_pk', 'player_name']).first()
+    # Restrict the cached starting and relief appearances to the selected dates
+    first_inning_appearances, relief_appearances = load_pitcher_appearances()
+    first_inning_appearances = filter_date_range(first_inning_appearances, start_date, end_date)
+    relief_appearances = filter_date_range(relief_appearances, start_date, end_date)
     
-    # Count starts and relief appearances for each pitcher
-    starts_count = first_inning_appearances.reset_index().groupby('player_name')['game_pk'].nunique().reset_index(name='starts')
-    relief_count = relief_appearances.reset_index().groupby('player_name')['game_pk'].nunique().reset_index(name='relief_games')
+    # Count starts and relief appearances for each pitcher (one row per game)
+    starts_count = first_inning_appearances.groupby('player_name', observed=True).size().rename('starts')
+    relief_count = relief_appearances.groupby('player_name', observed=True).size().rename('relief_games')
     
-    # Merge the counts
-    pitcher_appearances = pd.merge(starts_count, relief_count, on='player_name', how='outer').fillna(0)
+    # Combine the counts, which are already aligned on player_name
+    pitcher_appearances = pd.concat([starts_count, relief_count], axis=1).fillna(0).astype({'starts': 'int32', 'relief_games': 'int32'})
+    pitcher_appearances = pitcher_appearances.rename_axis('player_name').reset_index()
     pitcher_appearances['total_games'] = pitcher_appearances['starts'] + pitcher_appearances['relief_games']
     
     # Filter based on role selection
@@ -81,8 +186,8 @@ def process_pitching_data(data):
 st.sidebar.header("Filters")
 
 # Add date range filters
-min_date = pd.to_datetime(dbacks_data['game_date']).min()
-max_date = pd.to_datetime(dbacks_data['game_date']).max()
+min_date = dbacks_data['game_date'].min()
+max_date = dbacks_data['game_date'].max()
 
 start_date = st.sidebar.date_input(
     "Start Date",
@@ -99,49 +204,43 @@ end_date = st.sidebar.date_input(
 )
 
 # Filter data by date range
-filtered_data = dbacks_data[
-    (pd.to_datetime(dbacks_data['game_date']).dt.date >= start_date) &
-    (pd.to_datetime(dbacks_data['game_date']).dt.date <= end_date)
-]
+filtered_data = filter_date_range(dbacks_data, start_date, end_date)
 
 # Process the filtered data
-pitcher_data, pitcher_appearances = process_pitching_data(filtered_data)
-
-# Calculate pitch usage
-pitch_counts = pitcher_data.groupby(['player_name', 'pitch_name']).size().reset_index(name='count')
-pitch_usage = pitch_counts.pivot(index='player_name', columns='pitch_name', values='count').fillna(0)
-total_pitch_counts = pitch_usage.sum()
-sorted_pitch_columns = total_pitch_counts.sort_values(ascending=False).index
-pitch_usage = pitch_usage[sorted_pitch_columns]
+pitcher_data, pitcher_appearances = process_pitching_data(filtered_data, start_date, end_date)
+
+# Calculate pitch usage (dropna=True also limits crosstab to observed categories)
+pitch_usage = pd.crosstab(pitcher_data['player_name'], pitcher_data['pitch_name'], dropna=True)
+# Order pitch types by total usage, sorting the column sums directly in NumPy
+pitch_order = np.argsort(-pitch_usage.to_numpy().sum(axis=0), kind='stable')
+pitch_usage = pitch_usage.iloc[:, pitch_order]
 pitch_percentages = pitch_usage.div(pitch_usage.sum(axis=1), axis=0) * 100
 
+# Velocity summary per pitcher and pitch type, shared by the individual and team-wide tables
+team_velo = pitcher_data.groupby(['player_name', 'pitch_name'], observed=True)['release_speed'].agg(
+    mean='mean',
+    vmin='min',
+    vmax='max',
+    count='size'
+)
+
 # Sort pitchers and create labels based on role
 pitcher_role = st.session_state.get('pitcher_role', "Starters Only")
 if pitcher_role == "Starters Only":
-    sorted_pitchers = pitcher_appearances.sort_values('starts', ascending=False)
-    pitcher_labels = [f"{name} ({int(starts)} starts)" for name, starts in 
-                     zip(sorted_pitchers['player_name'], sorted_pitchers['starts'])]
+    count_column, suffix = 'starts', 'starts'
 elif pitcher_role == "Relievers Only":
-    sorted_pitchers = pitcher_appearances.sort_values('relief_games', ascending=False)
-    pitcher_labels = [f"{name} ({int(relief)} games)" for name, relief in 
-                     zip(sorted_pitchers['player_name'], sorted_pitchers['relief_games'])]
+    count_column, suffix = 'relief_games', 'games'
 else:
-    sorted_pitchers = pitcher_appearances.sort_values('total_games', ascending=False)
-    pitcher_labels = [f"{name} ({int(total)} games)" for name, total in 
-                     zip(sorted_pitchers['player_name'], sorted_pitchers['total_games'])]
+    count_column, suffix = 'total_games', 'games'
 
-pitch_percentages = pitch_percentages.loc[sorted_pitchers['player_name']]
-
-# Create interactive stacked bar chart using plotly
-fig = go.Figure()
+pitcher_order = np.argsort(-pitcher_appearances[count_column].to_numpy(), kind='stable')
+sorted_pitchers = pitcher_appearances.iloc[pitcher_order]
+pitcher_labels = (
+    sorted_pitchers['player_name'].astype(str) + ' (' +
+    sorted_pitchers[count_column].astype('int32').astype(str) + f' {suffix})'
+).tolist()
 
-for pitch_type in pitch_percentages.columns:
-    fig.add_trace(go.Bar(
-        name=pitch_type,
-        y=pitcher_labels,
-        x=pitch_percentages[pitch_type],
-        orientation='h'
-    ))
+pitch_percentages = pitch_percentages.loc[sorted_pitchers['player_name']]
 
 role_title = {
     "Starters Only": "Starting Rotation",
@@ -149,19 +248,45 @@ role_title = {
     "All Pitchers": "Pitching Staff"
 }
 
-fig.update_layout(
-    barmode='stack',
-    title=f'Pitch Type Distribution - {role_title[pitcher_role]} (2025)',
-    xaxis_title='Usage Percentage (%)',
-    yaxis_title='Pitcher (Appearances)',
-    height=600,
-    showlegend=True,
-    legend_title='Pitch Type',
-    yaxis={'categoryorder': 'total ascending'}
-)
+# Create interactive stacked bar chart using plotly
+@st.cache_data
+def build_stacked_bar(pitch_percentages, pitcher_labels, pitcher_role):
+    """Build the pitch type distribution chart, rebuilt only when its inputs change."""
+    # One long-format frame gives a single px.bar call instead of a trace per pitch type
+    usage_long = (
+        pitch_percentages.set_axis(pitcher_labels, axis=0)
+        .rename_axis('pitcher')
+        .reset_index()
+        .melt('pitcher', var_name='pitch_name', value_name='percentage')
+    )
+    
+    fig = px.bar(
+        usage_long,
+        x='percentage',
+        y='pitcher',
+        color='pitch_name',
+        orientation='h',
+        category_orders={'pitch_name': list(pitch_percentages.columns)},
+        labels={'percentage': 'Usage Percentage (%)', 'pitcher': 'Pitcher', 'pitch_name': 'Pitch Type'}
+    )
+    
+    fig.update_layout(
+        barmode='stack',
+        title=f'Pitch Type Distribution - {role_title[pitcher_role]} (2025)',
+        xaxis_title='Usage Percentage (%)',
+        yaxis_title='Pitcher (Appearances)',
+        height=600,
+        showlegend=True,
+        legend_title='Pitch Type',
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    
+    # Add gridlines
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+    
+    return fig
 
-# Add gridlines
-fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+fig = build_stacked_bar(pitch_percentages, pitcher_labels, pitcher_role)
 
 # Display the plot
 st.plotly_chart(fig, use_container_width=True)
@@ -182,90 +307,124 @@ st.markdown("---")
 st.header("Individual Pitcher Analysis")
 
 # Get list of pitchers
-available_pitchers = sorted(pitcher_data['player_name'].unique())
+available_pitchers = pitcher_data['player_name'].cat.remove_unused_categories().cat.categories.tolist()
 selected_pitcher = st.selectbox("Select a pitcher", available_pitchers)
 
 # Filter data for selected pitcher
-pitcher_specific_data = pitcher_data[pitcher_data['player_name'] == selected_pitcher].copy()
-pitcher_specific_data['game_date'] = pd.to_datetime(pitcher_specific_data['game_date'])
+pitcher_specific_data = pitcher_data[pitcher_data['player_name'] == selected_pitcher]
 
-# Calculate pitch mix over time
-pitch_dates = pitcher_specific_data.groupby(['game_date', 'pitch_name']).size().reset_index(name='count')
-pitch_dates_pivot = pitch_dates.pivot(index='game_date', columns='pitch_name', values='count').fillna(0)
+# Calculate pitch mix over time, with a row for every calendar day
+pitch_dates_pivot = pd.crosstab(pitcher_specific_data['game_date'], pitcher_specific_data['pitch_name'], dropna=True)
+pitch_dates_pivot = pitch_dates_pivot.asfreq('D', fill_value=0)
 
 # Calculate 7-day rolling average for smoother lines
-rolling_mix = pitch_dates_pivot.rolling(window=7, min_periods=1, center=True).sum()
-rolling_percentages = rolling_mix.div(rolling_mix.sum(axis=1), axis=0) * 100
+rolling_mix = pitch_dates_pivot.rolling(window=7, min_periods=1, center=True).sum().to_numpy()
+rolling_totals = rolling_mix.sum(axis=1)
+
+# Skip days with no pitches anywhere in their window (e.g. time on the IL)
+has_pitches = rolling_totals > 0
+rolling_percentages = pd.DataFrame(
+    rolling_mix[has_pitches] / rolling_totals[has_pitches, np.newaxis] * 100,
+    index=pitch_dates_pivot.index[has_pitches],
+    columns=pitch_dates_pivot.columns
+)
 
 # Create enhanced time series plot
-fig_time = go.Figure()
-
-for pitch_type in rolling_percentages.columns:
-    fig_time.add_trace(go.Scatter(
-        x=rolling_percentages.index,
-        y=rolling_percentages[pitch_type],
-        name=pitch_type,
-        mode='lines',
-        line=dict(width=3, shape='spline'),  # Thicker lines with smooth curves
-        hovertemplate=f"<b>%{{y:.1f}}%</b> {pitch_type}<br>%{{x|%B %d}}<extra></extra>"
-    ))
-
-fig_time.update_layout(
-    title=dict(
-        text=f'Pitch Mix Trends - {selected_pitcher}',
-        font=dict(size=20, color='white')
-    ),
-    xaxis_title=dict(text='Date', font=dict(color='white')),
-    yaxis_title=dict(text='Usage Percentage (%)', font=dict(color='white')),
-    hovermode='x unified',
-    height=500,  # Slightly taller
-    showlegend=True,
-    legend_title=dict(text='Pitch Type', font=dict(color='white')),
-    legend=dict(
-        yanchor="top",
-        y=0.99,
-        xanchor="left",
-        x=1.02,
-        font=dict(color='white'),
-        bgcolor='rgba(0,0,0,0)'
-    ),
-    margin=dict(r=150),  # More room for legend
-    paper_bgcolor='rgb(17, 17, 17)',  # Dark background for the entire plot
-    plot_bgcolor='rgb(17, 17, 17)',   # Dark background for the plotting area
-    yaxis=dict(
-        gridcolor='rgba(255, 255, 255, 0.1)',
-        range=[0, 100],
-        ticksuffix='%',
-        zerolinecolor='rgba(255, 255, 255, 0.2)',
-        zerolinewidth=1,
-        tickfont=dict(color='white'),
-        tickcolor='white'
-    ),
-    xaxis=dict(
-        gridcolor='rgba(255, 255, 255, 0.1)',
-        tickformat='%B %d',
-        zerolinecolor='rgba(255, 255, 255, 0.2)',
-        zerolinewidth=1,
-        tickfont=dict(color='white'),
-        tickcolor='white'
+@st.cache_data
+def build_timeseries(rolling_percentages, selected_pitcher):
+    """Build the pitch mix trend chart, rebuilt only when its inputs change."""
+    mix_long = (
+        rolling_percentages.rename_axis('game_date')
+        .reset_index()
+        .melt('game_date', var_name='pitch_name', value_name='percentage')
     )
-)
+    
+    # Downsample each pitch type's line so long date ranges don't send every day to
+    # the browser. melt stacks the columns one after another, hence the 'F' order.
+    rolling_dates = rolling_percentages.index
+    day_numbers = ((rolling_dates - rolling_dates.min()) / pd.Timedelta(days=1)).to_numpy(dtype=float)
+    values = rolling_percentages.to_numpy()
+    keep_points = np.zeros(values.shape, dtype=bool)
+    for i in range(values.shape[1]):
+        keep_points[lttb_indices(day_numbers, values[:, i], MAX_POINTS_PER_TRACE), i] = True
+    mix_long = mix_long[keep_points.ravel(order='F')]
+    
+    fig_time = px.line(
+        mix_long,
+        x='game_date',
+        y='percentage',
+        color='pitch_name',
+        render_mode='webgl'  # Scattergl traces stay responsive over long date ranges
+    )
+    fig_time.update_traces(
+        line_width=3,  # Thicker lines
+        hovertemplate="<b>%{y:.1f}%</b> %{fullData.name}<br>%{x|%B %d}<extra></extra>"
+    )
+    
+    fig_time.update_layout(
+        title=dict(
+            text=f'Pitch Mix Trends - {selected_pitcher}',
+            font=dict(size=20, color='white')
+        ),
+        xaxis_title=dict(text='Date', font=dict(color='white')),
+        yaxis_title=dict(text='Usage Percentage (%)', font=dict(color='white')),
+        # Unified hover re-scans every trace on each mouse move, so only use it for small pitch mixes
+        hovermode='x unified' if len(rolling_percentages.columns) <= 5 else 'x',
+        height=500,  # Slightly taller
+        showlegend=True,
+        legend_title=dict(text='Pitch Type', font=dict(color='white')),
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=1.02,
+            font=dict(color='white'),
+            bgcolor='rgba(0,0,0,0)'
+        ),
+        margin=dict(r=150),  # More room for legend
+        paper_bgcolor='rgb(17, 17, 17)',  # Dark background for the entire plot
+        plot_bgcolor='rgb(17, 17, 17)',   # Dark background for the plotting area
+        yaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            range=[0, 100],
+            ticksuffix='%',
+            zerolinecolor='rgba(255, 255, 255, 0.2)',
+            zerolinewidth=1,
+            tickfont=dict(color='white'),
+            tickcolor='white'
+        ),
+        xaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            tickformat='%B %d',
+            zerolinecolor='rgba(255, 255, 255, 0.2)',
+            zerolinewidth=1,
+            tickfont=dict(color='white'),
+            tickcolor='white'
+        )
+    )
+    
+    return fig_time
+
+fig_time = build_timeseries(rolling_percentages, selected_pitcher)
 
 st.plotly_chart(fig_time, use_container_width=True)
 
 # Additional statistics for the selected pitcher
+is_selected = team_velo.index.get_level_values('player_name') == selected_pitcher
+pitch_stats = team_velo[is_selected].droplevel('player_name').reset_index()
+
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Pitch Velocities")
-    avg_velo = pitcher_specific_data.groupby('pitch_name')['release_speed'].agg(['mean', 'min', 'max']).reset_index()
+    avg_velo = pitch_stats[['pitch_name', 'mean', 'vmin', 'vmax']]
     avg_velo.columns = ['Pitch Type', 'Avg. Velocity', 'Min. Velocity', 'Max. Velocity']
     avg_velo = avg_velo.sort_values('Avg. Velocity', ascending=False)
     st.dataframe(avg_velo.round(1))
 
 with col2:
     st.subheader("Pitch Usage Summary")
-    pitch_summary = pitcher_specific_data.groupby('pitch_name').size().reset_index(name='Count')
+    pitch_summary = pitch_stats[['pitch_name', 'count']].rename(columns={'count': 'Count'})
     pitch_summary['Percentage'] = pitch_summary['Count'] / pitch_summary['Count'].sum() * 100
     pitch_summary = pitch_summary.sort_values('Count', ascending=False)
     st.dataframe(pitch_summary.round(1))
@@ -279,14 +438,14 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Pitch Velocities by Type")
-    avg_velo = pitcher_data.groupby(['player_name', 'pitch_name'])['release_speed'].mean().reset_index()
-    avg_velo = avg_velo.sort_values(['player_name', 'release_speed'], ascending=[True, False])
+    avg_velo = team_velo['mean'].reset_index()
+    avg_velo = avg_velo.sort_values(['player_name', 'mean'], ascending=[True, False])
     avg_velo.columns = ['Pitcher', 'Pitch Type', 'Avg. Velocity (mph)']
     st.dataframe(avg_velo.round(1))
 
 with col2:
     st.subheader("Total Pitches Thrown")
-    total_pitches = pitch_counts.groupby('player_name')['count'].sum().reset_index()
-    total_pitches = total_pitches.sort_values('count', ascending=False)
+    total_pitches = pitch_usage.sum(axis=1).astype('int32').rename('Total Pitches').reset_index()
+    total_pitches = total_pitches.sort_values('Total Pitches', ascending=False)
     total_pitches.columns = ['Pitcher', 'Total Pitches']
     st.dataframe(total_pitches)
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import sys
 import numpy as np
+from statcast_parquet import read_parquet_copy, write_parquet_copy
 
 # Add pybaseball to path
 sys.path.insert(0, r'c:\Users\valak\GitHub Repos\pybaseball')
@@ -26,34 +27,86 @@ st.set_page_config(
 st.title("🔥 Arizona Diamondbacks Advanced Pitching Analysis")
 st.markdown("Enhanced analysis with advanced metrics, league context, and pitcher performance insights.")
 
-# Enhanced data loading with caching
-@st.cache_data
-def load_data():
-    """Load and enhance the Diamondbacks statcast data"""
-    print("Loading data from dbacks_team_statcast.csv...")
-    data = pd.read_csv('dbacks_team_statcast.csv')
+def category_equals(column, value):
+    """Compare a categorical column against a single value using its integer codes"""
+    categories = column.cat.categories
+    if value not in categories:
+        return np.zeros(len(column), dtype=bool)
+    return column.cat.codes.to_numpy() == categories.get_loc(value)
+
+def add_pitch_outcome_flags(data):
+    """Add 0/1 pitch outcome columns derived from the type and description codes"""
+    pitch_result = data['type']
+    description = data['description']
+    
+    is_strike = category_equals(pitch_result, 'S')
+    is_swinging_strike = is_strike & category_equals(description, 'swinging_strike')
+    
+    # Match 'foul' against the handful of description categories, not every row
+    foul_codes = np.flatnonzero(description.cat.categories.str.contains('foul'))
+    is_foul = np.isin(description.cat.codes.to_numpy(), foul_codes)
     
     # Add derived metrics
-    data['called_strike'] = ((data['type'] == 'S') & (data['description'] == 'called_strike')).astype(int)
-    data['swinging_strike'] = ((data['type'] == 'S') & (data['description'] == 'swinging_strike')).astype(int)
-    data['whiff'] = data['swinging_strike']
-    data['contact'] = ((data['type'] == 'X') | (data['description'].str.contains('foul', na=False))).astype(int)
+    data['called_strike'] = (is_strike & category_equals(description, 'called_strike')).view(np.uint8)
+    data['swinging_strike'] = is_swinging_strike.view(np.uint8)
+    data['whiff'] = is_swinging_strike.view(np.uint8)
+    data['contact'] = (category_equals(pitch_result, 'X') | is_foul).view(np.uint8)
     
     # Calculate pitch efficiency metrics
-    data['strike'] = (data['type'] == 'S').astype(int)
-    data['ball'] = (data['type'] == 'B').astype(int)
+    data['strike'] = is_strike.view(np.uint8)
+    data['ball'] = category_equals(pitch_result, 'B').view(np.uint8)
+    
+    # Balls in play, so the aggregations can use a plain sum instead of a lambda
+    events = data['events']
+    data['bip'] = (events.notna() & (events != '')).to_numpy().view(np.uint8)
     
     return data
 
+# Statcast export and the Parquet copy shared with dashboard.py
+STATCAST_CSV = 'dbacks_team_statcast.csv'
+STATCAST_PARQUET = 'dbacks_team_statcast.parquet'
+
+# Columns the enhanced dashboard reads
+USED_COLUMNS = ['game_date', 'game_pk', 'player_name', 'pitch_name', 'pitch_number', 'inning',
+                'outs_when_up', 'home_team', 'away_team', 'inning_topbot', 'type', 'description',
+                'release_speed', 'woba_value', 'launch_speed', 'launch_angle', 'events', 'zone']
+
+# Repeated string columns, held as categories so comparisons and groupbys work on integer codes
+CATEGORY_DTYPES = {c: 'category' for c in ['player_name', 'pitch_name', 'type', 'description', 'home_team',
+                                           'away_team', 'inning_topbot', 'events', 'zone']}
+
+# Enhanced data loading with caching
 @st.cache_data
-def get_league_context():
+def load_data():
+    """Load and enhance the Diamondbacks statcast data"""
+    # Prefer the Parquet copy unless the CSV has been updated since it was written
+    data = read_parquet_copy(STATCAST_CSV, STATCAST_PARQUET, columns=USED_COLUMNS)
+    if data is not None:
+        print(f"Loaded data from {STATCAST_PARQUET}")
+        # The copy may have been written by dashboard.py with some of these as plain columns
+        data = data.astype(CATEGORY_DTYPES)
+    else:
+        print(f"Loading data from {STATCAST_CSV}...")
+        # Dates are parsed once here so the cached frame already holds datetime64 values
+        data = pd.read_csv(STATCAST_CSV, engine='pyarrow', parse_dates=['game_date'], dtype=CATEGORY_DTYPES)
+        
+        write_parquet_copy(data, STATCAST_PARQUET)
+        data = data[USED_COLUMNS]
+    
+    # Keep the rows in date order so date ranges can be sliced directly
+    data = data.sort_values('game_date', kind='stable').reset_index(drop=True)
+    
+    return add_pitch_outcome_flags(data)
+
+# Refetch at most hourly, and only once the league section is actually shown
+@st.cache_data(ttl=3600)
+def get_league_context(current_year):
     """Get league-wide pitching context for comparison"""
     try:
         # Enable caching for pybaseball
         pyb.cache.enable()
         
-        # Get current season team pitching data for context
-        current_year = 2025
+        # Get the season's team pitching data for context
         team_pitching_data = pyb.team_pitching(current_year)
         return team_pitching_data
     except Exception as e:
@@ -62,31 +115,28 @@ def get_league_context():
 
 # Load data
 dbacks_data = load_data()
-league_data = get_league_context()
 
-# Process the pitching data with enhanced metrics
-def process_enhanced_pitching_data(data):
-    """Enhanced processing with advanced metrics"""
+# Split out the Diamondbacks pitching and classify appearances once, since neither depends on the sidebar
+@st.cache_data
+def build_dbacks_pitching():
+    """Return the Diamondbacks pitching rows and per-game appearance stats"""
+    data = load_data()
+    
     # Identify plays where the Diamondbacks were the pitching team
     is_dbacks_pitching = ((data['home_team'] == 'AZ') & (data['inning_topbot'] == 'Top')) | \
                         ((data['away_team'] == 'AZ') & (data['inning_topbot'] == 'Bot'))
-    dbacks_pitching_data = data[is_dbacks_pitching].copy()
-    
-    # Get pitcher role selection from sidebar
-    pitcher_role = st.sidebar.selectbox(
-        "Filter by Role",
-        ["Starters Only", "Relievers Only", "All Pitchers"]
-    )
+    dbacks_pitching_data = data[is_dbacks_pitching]
     
     # Enhanced role identification
     # Group by game and pitcher to identify roles more accurately
-    game_pitcher_stats = dbacks_pitching_data.groupby(['game_pk', 'player_name']).agg({
+    game_pitcher_stats = dbacks_pitching_data.groupby(['game_pk', 'player_name'], observed=True).agg({
+        'game_date': 'first',
         'inning': ['min', 'max'],
         'pitch_number': 'count',
         'outs_when_up': 'max'
     }).reset_index()
     
-    game_pitcher_stats.columns = ['game_pk', 'player_name', 'first_inning', 'last_inning', 'total_pitches', 'max_outs']
+    game_pitcher_stats.columns = ['game_pk', 'player_name', 'game_date', 'first_inning', 'last_inning', 'total_pitches', 'max_outs']
     
     # Classify appearances more accurately
     game_pitcher_stats['is_starter'] = (game_pitcher_stats['first_inning'] == 1) & (game_pitcher_stats['total_pitches'] >= 50)
@@ -94,16 +144,44 @@ def process_enhanced_pitching_data(data):
     game_pitcher_stats['is_reliever'] = game_pitcher_stats['first_inning'] > 1
     game_pitcher_stats['is_closer'] = (game_pitcher_stats['last_inning'] >= 9) & (game_pitcher_stats['is_reliever'])
     
-    # Count appearances by type
-    pitcher_roles = game_pitcher_stats.groupby('player_name').agg({
-        'is_starter': 'sum',
-        'is_opener': 'sum', 
-        'is_reliever': 'sum',
-        'is_closer': 'sum',
-        'game_pk': 'nunique'
-    }).reset_index()
+    # The pitching rows keep the load order; put the appearances in date order too
+    game_pitcher_stats = game_pitcher_stats.sort_values('game_date', kind='stable').reset_index(drop=True)
     
-    pitcher_roles.columns = ['player_name', 'starts', 'openers', 'relief_games', 'saves_opps', 'total_games']
+    return dbacks_pitching_data, game_pitcher_stats
+
+def filter_date_range(data, start_date, end_date):
+    """Slice date-sorted data to [start_date, end_date] with a binary search instead of a mask"""
+    lo = data['game_date'].searchsorted(pd.Timestamp(start_date))
+    hi = data['game_date'].searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1))
+    return data.iloc[lo:hi]
+
+# Process the pitching data with enhanced metrics
+def process_enhanced_pitching_data(dbacks_pitching_data, game_pitcher_stats):
+    """Enhanced processing with advanced metrics"""
+    # Get pitcher role selection from sidebar
+    pitcher_role = st.sidebar.selectbox(
+        "Filter by Role",
+        ["Starters Only", "Relievers Only", "All Pitchers"]
+    )
+    
+    # Count appearances by type, tallying each role flag by pitcher code
+    player_column = game_pitcher_stats['player_name']
+    player_codes = player_column.cat.codes.to_numpy()
+    n_players = len(player_column.cat.categories)
+    role_counts = {
+        role: np.bincount(player_codes[game_pitcher_stats[flag].to_numpy()], minlength=n_players)
+        for role, flag in [('starts', 'is_starter'), ('openers', 'is_opener'),
+                           ('relief_games', 'is_reliever'), ('saves_opps', 'is_closer')]
+    }
+    # Each appearance row is one game for that pitcher
+    total_games = np.bincount(player_codes, minlength=n_players)
+    
+    appeared = np.flatnonzero(total_games)
+    pitcher_roles = pd.DataFrame({
+        'player_name': pd.Categorical.from_codes(appeared, dtype=player_column.dtype),
+        **{role: counts[appeared] for role, counts in role_counts.items()},
+        'total_games': total_games[appeared]
+    })
     
     # Filter based on role selection with enhanced criteria
     if pitcher_role == "Starters Only":
@@ -122,26 +200,29 @@ def process_enhanced_pitching_data(data):
         filtered_pitchers = pitcher_roles[pitcher_roles['total_games'] >= min_games]
         role_desc = f"Pitching Staff ({min_games}+ apps)"
     
-    filtered_pitcher_list = filtered_pitchers['player_name'].unique()
+    # pitcher_roles shares the pitching data's player categories, so match on integer codes
+    selected_codes = filtered_pitchers['player_name'].cat.codes.to_numpy()
     
     # Filter the data to include only the selected pitchers
-    filtered_data = dbacks_pitching_data[dbacks_pitching_data['player_name'].isin(filtered_pitcher_list)]
+    is_selected = np.isin(dbacks_pitching_data['player_name'].cat.codes.to_numpy(), selected_codes)
+    filtered_data = dbacks_pitching_data[is_selected]
     
     return filtered_data, filtered_pitchers, role_desc
 
 # Sidebar with enhanced filters
 st.sidebar.header("🎛️ Analysis Controls")
 
+# Date bounds of the loaded data, used by the freshness indicator and date filters
+min_date = dbacks_data['game_date'].min()
+max_date = dbacks_data['game_date'].max()
+
 # Add data freshness indicator
 if not dbacks_data.empty:
-    latest_date = pd.to_datetime(dbacks_data['game_date']).max().strftime('%B %d, %Y')
+    latest_date = max_date.strftime('%B %d, %Y')
     total_games = dbacks_data['game_pk'].nunique()
     st.sidebar.success(f"📊 Data current through {latest_date} ({total_games} games)")
 
 # Enhanced date range filters
-min_date = pd.to_datetime(dbacks_data['game_date']).min()
-max_date = pd.to_datetime(dbacks_data['game_date']).max()
-
 start_date = st.sidebar.date_input(
     "Start Date",
     value=min_date,
@@ -163,14 +244,14 @@ show_percentiles = st.sidebar.checkbox("Show League Percentiles", True)
 show_movement = st.sidebar.checkbox("Show Pitch Movement", True)
 show_performance = st.sidebar.checkbox("Show Performance Metrics", True)
 
-# Filter data by date range
-filtered_data = dbacks_data[
-    (pd.to_datetime(dbacks_data['game_date']).dt.date >= start_date) &
-    (pd.to_datetime(dbacks_data['game_date']).dt.date <= end_date)
-]
+# Filter the pitching rows and appearances by date range
+dbacks_pitching_data, game_pitcher_stats = build_dbacks_pitching()
 
 # Process the filtered data with enhancements
-pitcher_data, pitcher_appearances, role_description = process_enhanced_pitching_data(filtered_data)
+pitcher_data, pitcher_appearances, role_description = process_enhanced_pitching_data(
+    filter_date_range(dbacks_pitching_data, start_date, end_date),
+    filter_date_range(game_pitcher_stats, start_date, end_date)
+)
 
 if pitcher_data.empty:
     st.warning("No data available for the selected filters. Please adjust your criteria.")
@@ -179,25 +260,21 @@ if pitcher_data.empty:
 # Calculate enhanced pitch usage with efficiency metrics
 def calculate_pitch_metrics(data):
     """Calculate comprehensive pitch metrics"""
-    metrics = data.groupby(['player_name', 'pitch_name']).agg({
-        'pitch_name': 'count',  # Total pitches
-        'release_speed': ['mean', 'std'],
-        'strike': 'sum',
-        'ball': 'sum', 
-        'called_strike': 'sum',
-        'swinging_strike': 'sum',
-        'whiff': 'sum',
-        'contact': 'sum',
-        'events': lambda x: (x.notna() & (x != '')).sum(),  # Balls in play
-        'woba_value': 'mean',
-        'launch_speed': 'mean',
-        'launch_angle': 'mean'
-    }).reset_index()
-    
-    # Flatten column names
-    metrics.columns = ['player_name', 'pitch_name', 'count', 'avg_velo', 'velo_std', 
-                      'strikes', 'balls', 'called_strikes', 'swinging_strikes', 
-                      'whiffs', 'contact', 'balls_in_play', 'avg_woba', 'avg_exit_velo', 'avg_launch_angle']
+    metrics = data.groupby(['player_name', 'pitch_name'], observed=True).agg(
+        count=('pitch_name', 'size'),  # Total pitches
+        avg_velo=('release_speed', 'mean'),
+        velo_std=('release_speed', 'std'),
+        strikes=('strike', 'sum'),
+        balls=('ball', 'sum'),
+        called_strikes=('called_strike', 'sum'),
+        swinging_strikes=('swinging_strike', 'sum'),
+        whiffs=('whiff', 'sum'),
+        contact=('contact', 'sum'),
+        balls_in_play=('bip', 'sum'),
+        avg_woba=('woba_value', 'mean'),
+        avg_exit_velo=('launch_speed', 'mean'),
+        avg_launch_angle=('launch_angle', 'mean')
+    ).reset_index()
     
     # Calculate rates
     metrics['strike_rate'] = metrics['strikes'] / metrics['count'] * 100
@@ -209,12 +286,32 @@ def calculate_pitch_metrics(data):
 pitch_metrics = calculate_pitch_metrics(pitcher_data)
 
 # Create enhanced pitch usage visualization
-pitch_counts = pitch_metrics.groupby(['player_name', 'pitch_name'])['count'].sum().reset_index()
-pitch_usage = pitch_counts.pivot(index='player_name', columns='pitch_name', values='count').fillna(0)
-total_pitch_counts = pitch_usage.sum()
-sorted_pitch_columns = total_pitch_counts.sort_values(ascending=False).index
-pitch_usage = pitch_usage[sorted_pitch_columns]
-pitch_percentages = pitch_usage.div(pitch_usage.sum(axis=1), axis=0) * 100
+# Count pitches per pitcher and pitch type in one bincount over the category codes,
+# widened first so the combined index can't overflow the small code dtype
+player_names = pitcher_data['player_name'].cat.categories
+pitch_names = pitcher_data['pitch_name'].cat.categories
+player_codes = pitcher_data['player_name'].cat.codes.to_numpy().astype(np.intp)
+pitch_codes = pitcher_data['pitch_name'].cat.codes.to_numpy().astype(np.intp)
+has_pitch_name = pitch_codes >= 0
+usage_counts = np.bincount(
+    player_codes[has_pitch_name] * len(pitch_names) + pitch_codes[has_pitch_name],
+    minlength=len(player_names) * len(pitch_names)
+).reshape(len(player_names), len(pitch_names))
+
+# Keep only the pitchers and pitch types present in the filtered data
+used_players = usage_counts.sum(axis=1) > 0
+used_pitches = usage_counts.sum(axis=0) > 0
+usage_counts = usage_counts[np.ix_(used_players, used_pitches)]
+total_pitch_counts = pd.Series(usage_counts.sum(axis=0), index=pitch_names[used_pitches])
+
+# Order pitch types by total usage and convert each pitcher's row to percentages
+pitch_order = np.argsort(-total_pitch_counts.to_numpy(), kind='stable')
+usage_counts = usage_counts[:, pitch_order]
+pitch_percentages = pd.DataFrame(
+    usage_counts / usage_counts.sum(axis=1, keepdims=True) * 100,
+    index=player_names[used_players],
+    columns=total_pitch_counts.index[pitch_order]
+)
 
 # Sort pitchers with enhanced labeling
 sorted_pitchers = pitcher_appearances.sort_values(['starts', 'relief_games'], ascending=[False, False])
@@ -235,9 +332,6 @@ pitch_percentages = pitch_percentages.loc[sorted_pitchers['player_name']]
 # Main visualization
 st.header(f"🎯 Pitch Type Distribution - {role_description}")
 
-# Create enhanced interactive stacked bar chart
-fig = go.Figure()
-
 # Define colors for pitch types
 pitch_colors = {
     '4-Seam Fastball': '#FF6B6B',
@@ -252,16 +346,29 @@ pitch_colors = {
     'Other': '#C7ECEE'
 }
 
-for pitch_type in pitch_percentages.columns:
-    color = pitch_colors.get(pitch_type, pitch_colors['Other'])
-    fig.add_trace(go.Bar(
-        name=pitch_type,
-        y=enhanced_pitcher_labels,
-        x=pitch_percentages[pitch_type],
-        orientation='h',
-        marker_color=color,
-        hovertemplate=f"<b>%{{y}}</b><br>{pitch_type}: %{{x:.1f}}%<extra></extra>"
-    ))
+# Resolve each pitch_name category to its color once, so the charts can index by code
+pitch_categories = dbacks_data['pitch_name'].cat.categories
+color_by_code = np.array([pitch_colors.get(pitch_type, pitch_colors['Other']) for pitch_type in pitch_categories])
+
+# Create enhanced interactive stacked bar chart from one long-form frame instead of a trace per pitch type
+pitch_usage_long = (
+    pitch_percentages.set_axis(enhanced_pitcher_labels, axis=0)
+    .rename_axis('pitcher')
+    .reset_index()
+    .melt(id_vars='pitcher', var_name='pitch_type', value_name='usage')
+)
+bar_colors = color_by_code[pitch_categories.get_indexer(pitch_percentages.columns)]
+
+fig = px.bar(
+    pitch_usage_long,
+    x='usage',
+    y='pitcher',
+    color='pitch_type',
+    orientation='h',
+    color_discrete_map=dict(zip(pitch_percentages.columns, bar_colors)),
+    category_orders={'pitch_type': list(pitch_percentages.columns)}
+)
+fig.update_traces(hovertemplate="<b>%{y}</b><br>%{fullData.name}: %{x:.1f}%<extra></extra>")
 
 fig.update_layout(
     barmode='stack',
@@ -300,6 +407,117 @@ with col4:
     date_span = (end_date - start_date).days + 1
     st.metric("Date Range", f"{date_span} days")
 
+# Per-pitcher breakdowns for the deep dive, cached by pitcher and date range so tab
+# switches and unrelated widget changes don't redo the groupbys
+@st.cache_data
+def get_pitcher_data(pitcher, start_date, end_date):
+    """Return one pitcher's pitches within the date range"""
+    dbacks_pitching_data, _ = build_dbacks_pitching()
+    data = filter_date_range(dbacks_pitching_data, start_date, end_date)
+    return data[category_equals(data['player_name'], pitcher)]
+
+@st.cache_data
+def pitcher_daily_pitch_stats(pitcher, start_date, end_date):
+    """Pitch counts and velocity totals per game date and pitch type, shared by the mix and velocity tabs"""
+    pitcher_specific_data = get_pitcher_data(pitcher, start_date, end_date)
+    return pitcher_specific_data.groupby(['game_date', 'pitch_name'], observed=True).agg(
+        count=('pitch_name', 'size'),
+        velo_sum=('release_speed', 'sum'),
+        velo_count=('release_speed', 'count')
+    ).reset_index()
+
+@st.cache_data
+def pitcher_pitch_mix_time(pitcher, start_date, end_date):
+    """Rolling pitch mix percentages by game date"""
+    pitch_dates = pitcher_daily_pitch_stats(pitcher, start_date, end_date)
+    
+    # Enhanced pitch mix over time
+    pitch_dates_pivot = pitch_dates.pivot(index='game_date', columns='pitch_name', values='count').fillna(0)
+    # Pivoting the categorical groupby orders columns by category code; keep the traces alphabetical
+    pitch_dates_pivot = pitch_dates_pivot.sort_index(axis=1, key=lambda names: names.astype(str))
+    
+    # Calculate rolling average for trend analysis. A centered box sum is the difference of two
+    # rows of the cumulative counts, clipped at the ends like min_periods=1
+    window_size = min(7, len(pitch_dates_pivot))
+    counts = pitch_dates_pivot.to_numpy()
+    cumulative = np.vstack([np.zeros((1, counts.shape[1])), counts.cumsum(axis=0)])
+    rows = np.arange(len(counts))
+    lo = np.clip(rows - window_size // 2, 0, len(counts))
+    hi = np.clip(rows + (window_size - window_size // 2), 0, len(counts))
+    rolling_mix = cumulative[hi] - cumulative[lo]
+    
+    rolling_percentages = rolling_mix / rolling_mix.sum(axis=1, keepdims=True) * 100
+    return pd.DataFrame(rolling_percentages, index=pitch_dates_pivot.index, columns=pitch_dates_pivot.columns)
+
+@st.cache_data
+def pitcher_velo_stats(pitcher, start_date, end_date):
+    """Velocity summary per pitch type, fastest first"""
+    pitcher_specific_data = get_pitcher_data(pitcher, start_date, end_date)
+    velo_stats = pitcher_specific_data.groupby('pitch_name', observed=True)['release_speed'].agg(['mean', 'min', 'max', 'std']).reset_index()
+    velo_stats.columns = ['Pitch Type', 'Avg. Velocity', 'Min', 'Max', 'Std Dev']
+    return velo_stats.sort_values('Avg. Velocity', ascending=False)
+
+@st.cache_data
+def pitcher_velo_trend(pitcher, start_date, end_date):
+    """Average velocity per game date and pitch type"""
+    velo_time = pitcher_daily_pitch_stats(pitcher, start_date, end_date)
+    velo_time['release_speed'] = velo_time['velo_sum'] / velo_time['velo_count']
+    return velo_time[['game_date', 'pitch_name', 'release_speed']]
+
+@st.cache_data
+def pitcher_zone_counts(pitcher, start_date, end_date):
+    """Pitch counts per zone"""
+    pitcher_specific_data = get_pitcher_data(pitcher, start_date, end_date)
+    # Drop zones this pitcher never hit, which a categorical value_counts would list as zero
+    zone_data = pitcher_specific_data['zone'].cat.remove_unused_categories().value_counts().reset_index()
+    zone_data.columns = ['Zone', 'Count']
+    return zone_data
+
+@st.cache_data
+def pitcher_outcome_stats(pitcher, start_date, end_date):
+    """Batted ball outcomes per pitch type"""
+    pitcher_specific_data = get_pitcher_data(pitcher, start_date, end_date)
+    outcome_stats = pitcher_specific_data.groupby('pitch_name', observed=True).agg({
+        'woba_value': 'mean',
+        'launch_speed': 'mean', 
+        'launch_angle': 'mean',
+        'bip': 'sum'
+    }).reset_index()
+    
+    outcome_stats.columns = ['Pitch Type', 'Avg wOBA', 'Avg Exit Velo', 'Avg Launch Angle', 'Balls in Play']
+    return outcome_stats.round(3)
+
+@st.cache_data
+def pitcher_recent_performance(pitcher, start_date, end_date):
+    """Per-game results over the pitcher's 10 most recent game dates"""
+    pitcher_specific_data = get_pitcher_data(pitcher, start_date, end_date)
+    if pitcher_specific_data.empty:
+        return pd.DataFrame(columns=['Date', 'Pitches', 'Strike Rate (%)', 'Whiff Rate (%)', 'Avg wOBA'])
+    
+    # The rows are already in date order, so each game date is a contiguous run
+    dates = pitcher_specific_data['game_date'].to_numpy()
+    run_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    recent_starts = run_starts[-10:]
+    
+    # Sum each run of the recent rows with reduceat instead of a groupby
+    recent_games = pitcher_specific_data.iloc[recent_starts[0]:]
+    offsets = recent_starts - recent_starts[0]
+    woba = recent_games['woba_value'].to_numpy()
+    pitches = np.add.reduceat(recent_games['pitch_name'].notna().to_numpy(), offsets, dtype=np.int64)
+    strikes = np.add.reduceat(recent_games['strike'].to_numpy(), offsets, dtype=np.int64)
+    whiffs = np.add.reduceat(recent_games['whiff'].to_numpy(), offsets, dtype=np.int64)
+    woba_sum = np.add.reduceat(np.nan_to_num(woba), offsets)
+    woba_count = np.add.reduceat(~np.isnan(woba), offsets, dtype=np.int64)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'Date': dates[recent_starts],
+            'Pitches': pitches,
+            'Strike Rate (%)': (strikes / pitches * 100).round(1),
+            'Whiff Rate (%)': (whiffs / pitches * 100).round(1),
+            'Avg wOBA': woba_sum / woba_count
+        })
+
 # Individual Pitcher Analysis with Enhancements
 st.markdown("---")
 st.header("🔍 Individual Pitcher Deep Dive")
@@ -308,30 +526,17 @@ available_pitchers = sorted(pitcher_data['player_name'].unique())
 selected_pitcher = st.selectbox("Select a pitcher for detailed analysis", available_pitchers)
 
 if selected_pitcher:
-    pitcher_specific_data = pitcher_data[pitcher_data['player_name'] == selected_pitcher].copy()
-    pitcher_specific_data['game_date'] = pd.to_datetime(pitcher_specific_data['game_date'])
-    
     # Create tabs for different analyses
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Pitch Mix Trends", "⚡ Velocity Analysis", "🎯 Command Metrics", "📈 Performance"])
     
     with tab1:
-        # Enhanced pitch mix over time
-        pitch_dates = pitcher_specific_data.groupby(['game_date', 'pitch_name']).size().reset_index(name='count')
-        pitch_dates_pivot = pitch_dates.pivot(index='game_date', columns='pitch_name', values='count').fillna(0)
-        
-        # Calculate rolling average for trend analysis
-        window_size = min(7, len(pitch_dates_pivot))
-        if window_size > 1:
-            rolling_mix = pitch_dates_pivot.rolling(window=window_size, min_periods=1, center=True).sum()
-            rolling_percentages = rolling_mix.div(rolling_mix.sum(axis=1), axis=0) * 100
-        else:
-            rolling_percentages = pitch_dates_pivot.div(pitch_dates_pivot.sum(axis=1), axis=0) * 100
+        rolling_percentages = pitcher_pitch_mix_time(selected_pitcher, start_date, end_date)
         
         # Enhanced time series plot
         fig_time = go.Figure()
         
-        for pitch_type in rolling_percentages.columns:
-            color = pitch_colors.get(pitch_type, pitch_colors['Other'])
+        line_colors = color_by_code[pitch_categories.get_indexer(rolling_percentages.columns)]
+        for pitch_type, color in zip(rolling_percentages.columns, line_colors):
             fig_time.add_trace(go.Scatter(
                 x=rolling_percentages.index,
                 y=rolling_percentages[pitch_type],
@@ -360,14 +565,13 @@ if selected_pitcher:
         
         with col1:
             st.subheader("Velocity by Pitch Type")
-            velo_stats = pitcher_specific_data.groupby('pitch_name')['release_speed'].agg(['mean', 'min', 'max', 'std']).reset_index()
-            velo_stats.columns = ['Pitch Type', 'Avg. Velocity', 'Min', 'Max', 'Std Dev']
-            velo_stats = velo_stats.sort_values('Avg. Velocity', ascending=False)
+            velo_stats = pitcher_velo_stats(selected_pitcher, start_date, end_date)
             
             # Create velocity chart
             fig_velo = go.Figure()
             
-            for _, row in velo_stats.iterrows():
+            velo_colors = color_by_code[velo_stats['Pitch Type'].cat.codes.to_numpy()]
+            for (_, row), color in zip(velo_stats.iterrows(), velo_colors):
                 pitch_type = row['Pitch Type']
                 avg_velo = row['Avg. Velocity']
                 min_velo = row['Min']
@@ -383,7 +587,7 @@ if selected_pitcher:
                         arrayminus=[avg_velo - min_velo]
                     ),
                     mode='markers',
-                    marker=dict(size=12, color=pitch_colors.get(pitch_type, pitch_colors['Other'])),
+                    marker=dict(size=12, color=color),
                     name=pitch_type,
                     showlegend=False
                 ))
@@ -402,7 +606,7 @@ if selected_pitcher:
             st.subheader("Velocity Trends Over Time")
             
             # Velocity over time
-            pitcher_velo_time = pitcher_specific_data.groupby(['game_date', 'pitch_name'])['release_speed'].mean().reset_index()
+            pitcher_velo_time = pitcher_velo_trend(selected_pitcher, start_date, end_date)
             
             fig_velo_time = px.line(
                 pitcher_velo_time, 
@@ -430,7 +634,7 @@ if selected_pitcher:
             command_stats = pitch_metrics[pitch_metrics['player_name'] == selected_pitcher]
             
             if not command_stats.empty:
-                command_display = command_stats[['pitch_name', 'strike_rate', 'called_strike_rate', 'whiff_rate']].copy()
+                command_display = command_stats[['pitch_name', 'strike_rate', 'called_strike_rate', 'whiff_rate']]
                 command_display.columns = ['Pitch Type', 'Strike Rate (%)', 'Called Strike Rate (%)', 'Whiff Rate (%)']
                 command_display = command_display.sort_values('Strike Rate (%)', ascending=False)
                 st.dataframe(command_display.round(1))
@@ -439,9 +643,8 @@ if selected_pitcher:
             st.subheader("Location Analysis")
             
             # Zone analysis
-            if 'zone' in pitcher_specific_data.columns:
-                zone_data = pitcher_specific_data['zone'].value_counts().reset_index()
-                zone_data.columns = ['Zone', 'Count']
+            if 'zone' in pitcher_data.columns:
+                zone_data = pitcher_zone_counts(selected_pitcher, start_date, end_date)
                 
                 fig_zone = px.bar(zone_data, x='Zone', y='Count', 
                                 title="Pitch Location Distribution")
@@ -455,35 +658,15 @@ if selected_pitcher:
             st.subheader("Outcome Analysis")
             
             # Calculate performance by pitch type
-            outcome_stats = pitcher_specific_data.groupby('pitch_name').agg({
-                'woba_value': 'mean',
-                'launch_speed': 'mean', 
-                'launch_angle': 'mean',
-                'events': lambda x: (x.notna() & (x != '')).sum()
-            }).reset_index()
-            
-            outcome_stats.columns = ['Pitch Type', 'Avg wOBA', 'Avg Exit Velo', 'Avg Launch Angle', 'Balls in Play']
-            outcome_stats = outcome_stats.round(3)
+            outcome_stats = pitcher_outcome_stats(selected_pitcher, start_date, end_date)
             st.dataframe(outcome_stats)
         
         with col2:
             st.subheader("Recent Performance")
             
-            # Performance over last 10 games
-            recent_games = pitcher_specific_data.nlargest(10, 'game_date')
-            if not recent_games.empty:
-                recent_performance = recent_games.groupby('game_date').agg({
-                    'pitch_name': 'count',
-                    'strike': 'sum',
-                    'whiff': 'sum',
-                    'woba_value': 'mean'
-                }).reset_index()
-                
-                recent_performance['strike_rate'] = (recent_performance['strike'] / recent_performance['pitch_name'] * 100).round(1)
-                recent_performance['whiff_rate'] = (recent_performance['whiff'] / recent_performance['pitch_name'] * 100).round(1)
-                
-                recent_display = recent_performance[['game_date', 'pitch_name', 'strike_rate', 'whiff_rate', 'woba_value']]
-                recent_display.columns = ['Date', 'Pitches', 'Strike Rate (%)', 'Whiff Rate (%)', 'Avg wOBA']
+            # Performance over last 10 game dates
+            recent_display = pitcher_recent_performance(selected_pitcher, start_date, end_date)
+            if not recent_display.empty:
                 st.dataframe(recent_display.round(3))
 
 # Team-wide Analysis
@@ -496,7 +679,7 @@ with col1:
     st.subheader("Pitcher Efficiency Rankings")
     
     # Calculate efficiency metrics per pitcher
-    efficiency_stats = pitch_metrics.groupby('player_name').agg({
+    efficiency_stats = pitch_metrics.groupby('player_name', observed=True).agg({
         'count': 'sum',
         'strikes': 'sum',
         'whiffs': 'sum',
@@ -509,8 +692,10 @@ with col1:
     
     # Merge with appearance data
     efficiency_with_apps = pd.merge(efficiency_stats, pitcher_appearances, on='player_name')
-    efficiency_display = efficiency_with_apps[efficiency_with_apps['total_games'] >= 5].copy()
-    efficiency_display = efficiency_display[['player_name', 'total_games', 'count', 'strike_rate', 'whiff_rate', 'avg_woba']]
+    efficiency_display = efficiency_with_apps.loc[
+        efficiency_with_apps['total_games'] >= 5,
+        ['player_name', 'total_games', 'count', 'strike_rate', 'whiff_rate', 'avg_woba']
+    ]
     efficiency_display.columns = ['Pitcher', 'Games', 'Total Pitches', 'Strike Rate (%)', 'Whiff Rate (%)', 'Avg wOBA Against']
     efficiency_display = efficiency_display.sort_values('Strike Rate (%)', ascending=False)
     
@@ -520,7 +705,7 @@ with col2:
     st.subheader("Pitch Type Effectiveness")
     
     # Team-wide pitch type performance
-    team_pitch_performance = pitch_metrics.groupby('pitch_name').agg({
+    team_pitch_performance = pitch_metrics.groupby('pitch_name', observed=True).agg({
         'count': 'sum',
         'avg_velo': 'mean',
         'strike_rate': 'mean',
@@ -533,8 +718,9 @@ with col2:
     
     st.dataframe(team_pitch_performance.round(2))
 
-# League context if available
-if league_data is not None and show_percentiles:
+# League context if requested and available, for the season the data covers
+league_data = get_league_context(max_date.year) if show_percentiles else None
+if league_data is not None:
     st.markdown("---")
     st.header("📊 League Context & Rankings")
     
@@ -3,17 +3,18 @@
 # 1. Enhanced Data Processing - Add these calculated fields
 def enhance_statcast_data(data):
     """Add derived metrics to statcast data"""
-    data['called_strike'] = ((data['type'] == 'S') & (data['description'] == 'called_strike')).astype(int)
-    data['swinging_strike'] = ((data['type'] == 'S') & (data['description'] == 'swinging_strike')).astype(int)
+    is_strike = (data['type'] == 'S').to_numpy()
+    data['called_strike'] = (is_strike & (data['description'] == 'called_strike').to_numpy()).astype('uint8')
+    data['swinging_strike'] = (is_strike & (data['description'] == 'swinging_strike').to_numpy()).astype('uint8')
     data['whiff'] = data['swinging_strike']
-    data['strike'] = (data['type'] == 'S').astype(int)
-    data['ball'] = (data['type'] == 'B').astype(int)
+    data['strike'] = is_strike.astype('uint8')
+    data['ball'] = (data['type'] == 'B').to_numpy().astype('uint8')
     return data
 
 # 2. Better Role Classification
 def classify_pitcher_roles(data):
     """More accurate pitcher role identification"""
-    game_pitcher_stats = data.groupby(['game_pk', 'player_name']).agg({
+    game_pitcher_stats = data.groupby(['game_pk', 'player_name'], observed=True).agg({
         'inning': ['min', 'max'],
         'pitch_number': 'count',
     }).reset_index()
@@ -27,7 +28,7 @@ def classify_pitcher_roles(data):
 # 3. Performance Metrics Calculation
 def calculate_advanced_metrics(data):
     """Calculate pitch-level performance metrics"""
-    return data.groupby(['player_name', 'pitch_name']).agg({
+    return data.groupby(['player_name', 'pitch_name'], observed=True).agg({
         'pitch_name': 'count',
         'release_speed': 'mean',
         'strike': 'sum',
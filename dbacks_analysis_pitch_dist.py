@@ -1,63 +1,128 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-
-# Load the data from the local CSV file.
-print("Loading data from dbacks_team_statcast.csv...")
-dbacks_data = pd.read_csv('dbacks_team_statcast.csv')
+from statcast_parquet import read_parquet_copy, write_parquet_copy
+
+# Statcast export and the Parquet copy shared with the dashboards
+STATCAST_CSV = 'dbacks_team_statcast.csv'
+STATCAST_PARQUET = 'dbacks_team_statcast.parquet'
+
+# Columns this script uses
+USED_COLUMNS = ['game_pk', 'player_name', 'pitch_name', 'home_team', 'away_team', 'inning_topbot', 'inning']
+
+# Repeated string columns, loaded as categories
+CATEGORY_DTYPES = {c: 'category' for c in ['player_name', 'pitch_name', 'home_team', 'away_team', 'inning_topbot']}
+
+def category_equals(column, value):
+    """Compare a categorical column against a single value using its integer codes."""
+    categories = column.cat.categories
+    if value not in categories:
+        return np.zeros(len(column), dtype=bool)
+    return column.cat.codes.to_numpy() == categories.get_loc(value)
+
+def load_pitches():
+    """Load the statcast pitches, preferring the Parquet copy unless the CSV is newer."""
+    data = read_parquet_copy(STATCAST_CSV, STATCAST_PARQUET, columns=USED_COLUMNS)
+    if data is not None:
+        print(f"Loaded data from {STATCAST_PARQUET}")
+        # The copy may have been written with some of these as plain columns
+        return data.astype(CATEGORY_DTYPES)
+    
+    print(f"Loading data from {STATCAST_CSV}...")
+    data = pd.read_csv(STATCAST_CSV, engine='pyarrow', parse_dates=['game_date'], dtype=CATEGORY_DTYPES)
+    
+    write_parquet_copy(data, STATCAST_PARQUET)
+    return data[USED_COLUMNS]
+
+# Load the data, from the Parquet copy when it is up to date.
+dbacks_data = load_pitches()
 print("Data loaded successfully!")
 
-# Identify plays where the Diamondbacks were the pitching team
-is_dbacks_pitching = ((dbacks_data['home_team'] == 'AZ') & (dbacks_data['inning_topbot'] == 'Top')) | \
-                     ((dbacks_data['away_team'] == 'AZ') & (dbacks_data['inning_topbot'] == 'Bot'))
-dbacks_pitching_data = dbacks_data[is_dbacks_pitching].copy()
-
-# Identify the starting pitchers (those who pitched in the 1st inning)
-first_inning_pitchers = dbacks_pitching_data[dbacks_pitching_data['inning'] == 1]
-
-# Count the number of starts for each pitcher (unique games started)
-starts_count = first_inning_pitchers.groupby('player_name')['game_pk'].nunique().reset_index(name='starts')
+# Identify plays where the Diamondbacks were the pitching team, comparing category codes
+is_top = category_equals(dbacks_data['inning_topbot'], 'Top')
+is_bot = category_equals(dbacks_data['inning_topbot'], 'Bot')
+is_dbacks_pitching = (category_equals(dbacks_data['home_team'], 'AZ') & is_top) | \
+                     (category_equals(dbacks_data['away_team'], 'AZ') & is_bot)
+dbacks_pitching_data = dbacks_data[is_dbacks_pitching]
+
+# Identify the starting pitchers (those who pitched in the 1st inning), reading only the two columns needed
+inning1_mask = dbacks_pitching_data['inning'].to_numpy() == 1
+first_inning = dbacks_pitching_data.loc[inning1_mask, ['player_name', 'game_pk']]
+player_names = dbacks_pitching_data['player_name'].cat.categories
+
+# Count the number of starts for each pitcher (unique games started), one row per category
+starts_count = (
+    first_inning.groupby('player_name', observed=False)['game_pk']
+    .nunique()
+    .reset_index(name='starts')
+)
 
 # Filter for pitchers with at least 10 starts
 main_starters = starts_count[starts_count['starts'] >= 10]
+if main_starters.empty:
+    # Early in the season (or on an empty export) there is nothing to chart yet
+    raise SystemExit("No pitchers with at least 10 starts in the data yet.")
 main_starters_list = main_starters['player_name'].unique()
 
-# Filter the data to include only the main starting pitchers
-starter_data = dbacks_pitching_data[dbacks_pitching_data['player_name'].isin(main_starters_list)]
-
-# Calculate pitch counts for each starter
-pitch_counts = starter_data.groupby(['player_name', 'pitch_name']).size().reset_index(name='count')
-
-# Pivot the data to get pitch usage percentages
-pitch_usage = pitch_counts.pivot(index='player_name', columns='pitch_name', values='count').fillna(0)
+# Filter the data to include only the main starting pitchers, matching on category codes
+starter_codes = player_names.get_indexer(main_starters_list)
+starter_data = dbacks_pitching_data[np.isin(dbacks_pitching_data['player_name'].cat.codes.to_numpy(), starter_codes)]
+
+# Count pitch types for each starter in one bincount over combined (pitcher, pitch type) codes
+pitch_names = starter_data['pitch_name'].cat.categories
+starter_player_codes = starter_data['player_name'].cat.codes.to_numpy().astype(np.intp)
+starter_pitch_codes = starter_data['pitch_name'].cat.codes.to_numpy().astype(np.intp)
+has_pitch_name = starter_pitch_codes >= 0
+pitch_counts = np.bincount(
+    starter_player_codes[has_pitch_name] * len(pitch_names) + starter_pitch_codes[has_pitch_name],
+    minlength=len(player_names) * len(pitch_names)
+).reshape(len(player_names), len(pitch_names))
+# Keep the starters' rows and only the pitch types they threw
+used_pitches = pitch_counts[starter_codes].sum(axis=0) > 0
+pitch_counts = pitch_counts[np.ix_(starter_codes, used_pitches)]
+
+# Calculate pitch usage percentages for each starter
+pitch_percentages = pd.DataFrame(
+    pitch_counts / pitch_counts.sum(axis=1, keepdims=True) * 100,
+    index=pd.Index(player_names[starter_codes], name='player_name'),
+    columns=pd.Index(pitch_names[used_pitches], name='pitch_name')
+)
 
 # Calculate total counts for each pitch type across all pitchers
-total_pitch_counts = pitch_usage.sum()
+total_pitch_counts = pd.Series(pitch_counts.sum(axis=0), index=pitch_percentages.columns)
 # Sort columns (pitch types) by total usage
-sorted_pitch_columns = total_pitch_counts.sort_values(ascending=False).index
+sorted_pitch_columns = total_pitch_counts.sort_values(ascending=False, kind='stable').index
 
 # Reorder the columns based on sorted pitch types
-pitch_usage = pitch_usage[sorted_pitch_columns]
-pitch_percentages = pitch_usage.div(pitch_usage.sum(axis=1), axis=0) * 100
+pitch_percentages = pitch_percentages[sorted_pitch_columns]
 
 # --- Visualization ---
 print("Generating pitch usage visualization...")
 
-# Sort pitchers by number of starts (descending)
-sorted_main_starters = main_starters.sort_values('starts', ascending=False)
+# Sort pitchers by number of starts (descending) with one index permutation over the arrays
+starts_array = main_starters['starts'].to_numpy()
+starts_order = np.argsort(-starts_array, kind='stable')
+sorted_names = main_starters['player_name'].to_numpy()[starts_order]
+sorted_starts = starts_array[starts_order]
 # Create labels with pitcher names and starts
-pitcher_labels = [f"{name} ({starts} starts)" for name, starts in zip(sorted_main_starters['player_name'], sorted_main_starters['starts'])]
-pitch_percentages = pitch_percentages.loc[sorted_main_starters['player_name']]
-
-# Create the stacked bar chart
-ax = pitch_percentages.plot(
-    kind='barh', 
-    stacked=True, 
-    figsize=(12, 8), 
-    colormap='viridis'
-)
+pitcher_labels = [f"{name} ({starts} starts)" for name, starts in zip(sorted_names, sorted_starts)]
+pitch_percentages = pitch_percentages.loc[sorted_names]
+
+# Create the stacked bar chart with one barh call per pitch type, each stacked on the running total
+fig, ax = plt.subplots(figsize=(12, 8))
+bar_positions = np.arange(len(pitch_percentages))
+bar_left = np.zeros(len(pitch_percentages))
+viridis = plt.get_cmap('viridis')
+color_steps = np.linspace(0, 1, len(pitch_percentages.columns))
+for pitch, color_step in zip(pitch_percentages.columns, color_steps):
+    widths = pitch_percentages[pitch].to_numpy()
+    ax.barh(bar_positions, widths, height=0.5, left=bar_left, label=pitch, color=viridis(color_step))
+    bar_left += widths
+ax.set_ylim(bar_positions[0] - 0.5, bar_positions[-1] + 0.5)
 
 # Update y-axis labels with the number of starts
+ax.set_yticks(bar_positions)
 ax.set_yticklabels(pitcher_labels)
 
 # Set plot titles and labels
@@ -0,0 +1,43 @@
+"""Parquet copy of the statcast CSV shared by the dashboards and analysis scripts.
+
+The copy is trusted only while it is at least as new as the CSV, and it is always
+written through a temporary file so readers never see a partial file.
+"""
+import os
+import uuid
+import pandas as pd
+import pyarrow
+
+def parquet_is_current(csv_file, parquet_file):
+    """Check whether the Parquet copy exists and the CSV has not been updated since it was written."""
+    return os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= os.path.getmtime(csv_file)
+
+def read_parquet_copy(csv_file, parquet_file, columns=None):
+    """Read the Parquet copy when it is current, or return None so the caller reads the CSV."""
+    if not parquet_is_current(csv_file, parquet_file):
+        return None
+    try:
+        return pd.read_parquet(parquet_file, columns=columns)
+    except (OSError, pyarrow.lib.ArrowException) as e:
+        print(f"Could not read {parquet_file}, falling back to the CSV: {e}")
+        return None
+
+def write_parquet_copy(data, parquet_file):
+    """Write the Parquet copy, keeping every column so each script can read from it.
+
+    Returns True once the new copy has replaced the old one.
+    """
+    # A unique temporary name next to the copy, so concurrent writers don't collide
+    # and os.replace can swap it in atomically
+    tmp_file = f"{parquet_file}.{uuid.uuid4().hex}.tmp"
+    try:
+        data.to_parquet(tmp_file, compression='zstd', index=False)
+        os.replace(tmp_file, parquet_file)
+        return True
+    except Exception as e:
+        print(f"Could not write {parquet_file}: {e}")
+        return False
+    finally:
+        # Only left behind when the write did not complete
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
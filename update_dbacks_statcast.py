@@ -10,13 +10,21 @@ Features:
 - Automatic backup creation with timestamp
 - Duplicate detection and removal
 - Efficient data preservation for older games
+- Parquet copy kept next to the CSV for fast reads, with the CSV as the export
 
 Usage: python update_dbacks_statcast.py
 """
 
 import sys
 import os
+import shutil
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 import glob
 
@@ -24,28 +32,76 @@ import glob
 sys.path.insert(0, r'c:\Users\valak\GitHub Repos\pybaseball')
 
 import pybaseball as pyb
+from statcast_parquet import parquet_is_current, write_parquet_copy
+
+# Repeated string columns stored as categories in the Parquet copy, matching what the
+# dashboards and analysis script expect when they read it
+CATEGORY_COLUMNS = ['pitch_type', 'pitch_name', 'player_name', 'home_team', 'away_team',
+                    'inning_topbot', 'type', 'description', 'events']
+
+def get_parquet_file(csv_file):
+    """Return the path of the Parquet copy that sits next to the CSV file."""
+    return csv_file.replace('.csv', '.parquet')
+
+def get_data_file(csv_file):
+    """Return the Parquet copy if it is at least as new as the CSV and readable, otherwise the CSV."""
+    parquet_file = get_parquet_file(csv_file)
+    if parquet_is_current(csv_file, parquet_file):
+        try:
+            # Reading the footer is enough to catch a damaged copy
+            pq.read_metadata(parquet_file)
+            return parquet_file
+        except (OSError, pa.lib.ArrowException) as e:
+            print(f"⚠️  Could not read Parquet copy, using the CSV: {e}")
+    return csv_file
+
+def read_statcast_file(filepath, columns=None, parse_dates=False):
+    """Read a statcast CSV or Parquet file, depending on its suffix.
+
+    With parse_dates, a CSV's game_date column is parsed on read; the Parquet
+    copy already stores it as datetime64.
+    """
+    if filepath.endswith('.parquet'):
+        return pd.read_parquet(filepath, columns=columns)
+    return pd.read_csv(filepath, usecols=columns, parse_dates=['game_date'] if parse_dates else None)
+
+def read_rows_before(filepath, cutoff_date):
+    """Read the rows dated before cutoff_date, filtering a Parquet copy while it is scanned."""
+    if filepath.endswith('.parquet'):
+        return pd.read_parquet(filepath, filters=[('game_date', '<', cutoff_date)])
+    data = read_statcast_file(filepath, parse_dates=True)
+    return data[data['game_date'] < cutoff_date]
 
 def count_csv_rows(filepath):
-    """Count the number of rows in a CSV file (excluding header)."""
+    """Count the number of rows in a CSV or Parquet file (excluding header)."""
     try:
-        df = pd.read_csv(filepath)
-        return len(df)
+        if filepath.endswith('.parquet'):
+            # The row count is in the file footer
+            return pq.ParquetFile(filepath).metadata.num_rows
+        # Stream the file in batches, converting only one column
+        reader = pv.open_csv(filepath, convert_options=pv.ConvertOptions(include_columns=['game_date']))
+        return sum(batch.num_rows for batch in reader)
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return 0
 
-def get_last_game_date(filepath):
-    """Get the most recent game date from the CSV file."""
+def get_row_count_and_last_date(filepath):
+    """Get the row count and most recent game date from one read of the CSV or Parquet file."""
     try:
-        df = pd.read_csv(filepath)
-        if 'game_date' in df.columns and not df.empty:
-            # Convert to datetime and get the max date
-            df['game_date'] = pd.to_datetime(df['game_date'])
-            return df['game_date'].max().strftime('%Y-%m-%d')
-        return None
+        # Read just the game_date column, parsed straight to dates
+        if filepath.endswith('.parquet'):
+            table = pq.read_table(filepath, columns=['game_date'])
+        else:
+            table = pv.read_csv(filepath, convert_options=pv.ConvertOptions(
+                include_columns=['game_date'],
+                column_types={'game_date': pa.date32()}
+            ))
+        if table.num_rows:
+            return table.num_rows, pc.max(table.column('game_date')).as_py().strftime('%Y-%m-%d')
+        return 0, None
     except Exception as e:
-        print(f"Error reading last game date: {e}")
-        return None
+        print(f"Error reading game dates: {e}")
+        return 0, None
 
 def should_update(last_update_date, min_days_between_updates=7):
     """Check if enough time has passed since last update."""
@@ -63,32 +119,43 @@ def get_season_start_date():
     return f"{current_year}-03-20"  # Spring training/early season
 
 def verify_csv_file(filepath):
-    """Verify that the CSV file is valid and readable."""
+    """Verify that the CSV or Parquet file is valid and readable."""
     try:
-        df = pd.read_csv(filepath)
+        # Only the header, the row count and a small date sample are read, never the full data
+        if filepath.endswith('.parquet'):
+            columns = pq.read_schema(filepath).names
+        else:
+            columns = pd.read_csv(filepath, nrows=0).columns
         
         # Basic checks
-        if df.empty:
+        if len(columns) == 0:
             return False, "File is empty"
         
         # Check for required columns
         required_columns = ['pitch_type', 'game_date', 'player_name', 'batter', 'pitcher']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in required_columns if col not in columns]
         if missing_columns:
             return False, f"Missing required columns: {missing_columns}"
         
-        # Check data types and basic integrity
-        if 'game_date' in df.columns:
-            try:
-                pd.to_datetime(df['game_date'])
-            except:
-                return False, "Invalid game_date format"
+        row_count = count_csv_rows(filepath)
+        if row_count == 0:
+            return False, "File is empty"
+        
+        # Check data types and basic integrity on a sample of rows
+        if filepath.endswith('.parquet'):
+            date_sample = pd.read_parquet(filepath, columns=['game_date'])['game_date'].head(100)
+        else:
+            date_sample = pd.read_csv(filepath, usecols=['game_date'], nrows=100)['game_date']
+        try:
+            pd.to_datetime(date_sample)
+        except:
+            return False, "Invalid game_date format"
         
         # Check for reasonable data
-        if len(df) < 100:  # Expect at least 100 pitches for any meaningful dataset
-            return False, f"Suspiciously low row count: {len(df)}"
+        if row_count < 100:  # Expect at least 100 pitches for any meaningful dataset
+            return False, f"Suspiciously low row count: {row_count}"
         
-        return True, f"File verified successfully: {len(df):,} rows, {len(df.columns)} columns"
+        return True, f"File verified successfully: {row_count:,} rows, {len(columns)} columns"
         
     except Exception as e:
         return False, f"Verification failed: {str(e)}"
@@ -104,11 +171,14 @@ def main():
         print("❌ CSV file not found. Run initial data fetch first.")
         return
     
-    # Count existing rows and get last update date
-    existing_rows = count_csv_rows(csv_file)
-    last_game_date = get_last_game_date(csv_file)
+    # Read from the Parquet copy when it is current, since it loads much faster than the CSV
+    data_file = get_data_file(csv_file)
+    print(f"📂 Reading existing data from {os.path.basename(data_file)}")
     
-    print(f"📊 Current CSV has {existing_rows:,} rows")
+    # Count existing rows and get last update date from a single read of game_date
+    existing_rows, last_game_date = get_row_count_and_last_date(data_file)
+    
+    print(f"📊 Current data has {existing_rows:,} rows")
     print(f"📅 Last game date in data: {last_game_date}")
     
     # Check if update is needed (configurable)
@@ -140,11 +210,15 @@ def main():
     print(f"📡 Fetching complete dataset from {start_date} to {end_date}")
     
     try:
-        # Enable caching for large requests
+        # Enable caching for large requests, in a fixed folder next to the CSV so it persists
+        # across runs; pybaseball caches each day of the range separately, so a rerun only
+        # downloads the days it has not seen yet
+        pyb.cache.config.cache_directory = os.path.join(os.path.dirname(csv_file), 'statcast_cache')
         pyb.cache.enable()
         
-        # Fetch the complete updated dataset
-        updated_data = pyb.statcast(start_dt=start_date, end_dt=end_date, team='AZ')
+        # Fetch the complete updated dataset; pybaseball already splits the range into
+        # per-day requests and runs them on a thread pool, so no extra chunking is needed here
+        updated_data = pyb.statcast(start_dt=start_date, end_dt=end_date, team='AZ', parallel=True)
         
         if updated_data is None or updated_data.empty:
             print("ℹ️  No data available for the specified date range.")
@@ -155,21 +229,36 @@ def main():
         # For full refresh, we need to merge with data outside our refresh window
         print("🔄 Performing full refresh with data integrity preservation...")
         
-        existing_data = pd.read_csv(csv_file)
+        # game_date stays datetime64 from here until it is formatted on write
+        updated_data['game_date'] = pd.to_datetime(updated_data['game_date'])
+        keep_old_data = start_date > get_season_start_date()
         
-        if start_date > get_season_start_date():
-            # Keep data from before our refresh window
-            existing_data['game_date'] = pd.to_datetime(existing_data['game_date'])
-            cutoff_date = datetime.strptime(start_date, '%Y-%m-%d')
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            if keep_old_data:
+                # Keep old data that's outside our refresh window, read on a worker thread
+                # while the fresh pull is sorted
+                cutoff_date = datetime.strptime(start_date, '%Y-%m-%d')
+                old_data_future = executor.submit(read_rows_before, data_file, cutoff_date)
+            
+            # Sort only the fresh pull by date and game order; the saved data is already in this order.
+            # np.lexsort takes its keys last-to-first and sorts the plain integer arrays directly
+            pitch_order = np.lexsort((
+                updated_data['pitch_number'].to_numpy(np.int32),
+                updated_data['at_bat_number'].to_numpy(np.int32),
+                updated_data['game_pk'].to_numpy(np.int64),
+                updated_data['game_date'].to_numpy().view(np.int64),
+            ))
+            updated_data = updated_data.iloc[pitch_order]
             
-            # Keep old data that's outside our refresh window
-            old_data = existing_data[existing_data['game_date'] < cutoff_date]
+            if keep_old_data:
+                old_data = old_data_future.result()
+        
+        if keep_old_data:
             print(f"📦 Preserving {len(old_data):,} rows from before {start_date}")
             
-            # Combine old data with new refreshed data
+            # Combine old data with new refreshed data; every old row predates the
+            # refresh window, so appending keeps the combined frame sorted
             if not old_data.empty:
-                # Convert back to string for consistency
-                old_data['game_date'] = old_data['game_date'].dt.strftime('%Y-%m-%d')
                 final_data = pd.concat([old_data, updated_data], ignore_index=True)
             else:
                 final_data = updated_data
@@ -177,17 +266,15 @@ def main():
             # Complete season refresh
             final_data = updated_data
         
-        # Sort by date and game order for consistency
-        final_data['game_date'] = pd.to_datetime(final_data['game_date'])
-        final_data = final_data.sort_values(['game_date', 'game_pk', 'at_bat_number', 'pitch_number'])
-        final_data['game_date'] = final_data['game_date'].dt.strftime('%Y-%m-%d')
-        
         # Remove any potential duplicates (shouldn't happen, but safety first)
         before_dedup = len(final_data)
-        final_data = final_data.drop_duplicates(
-            subset=['game_pk', 'at_bat_number', 'pitch_number'], 
-            keep='last'
+        # Pack game_pk/at_bat_number/pitch_number into one uint64 key so only a single column is hashed
+        pitch_key = (
+            (final_data['game_pk'].to_numpy(np.uint64) << np.uint64(32))
+            | (final_data['at_bat_number'].to_numpy(np.uint64) << np.uint64(16))
+            | final_data['pitch_number'].to_numpy(np.uint64)
         )
+        final_data = final_data.iloc[~pd.Index(pitch_key).duplicated(keep='last')]
         after_dedup = len(final_data)
         
         if before_dedup != after_dedup:
@@ -198,27 +285,41 @@ def main():
         backup_file = csv_file.replace('.csv', f'_backup_{timestamp}.csv')
         if os.path.exists(csv_file):
             print(f"💾 Creating backup: {os.path.basename(backup_file)}")
-            os.rename(csv_file, backup_file)
+            # Hardlink the backup so nothing is copied; copy only where links are unsupported
+            try:
+                os.link(csv_file, backup_file)
+            except (AttributeError, OSError):
+                shutil.copyfile(csv_file, backup_file)
         
-        # Save updated data
+        # Save updated data to a temporary file so the CSV is only swapped once it verifies
+        tmp_file = csv_file + '.tmp'
         print(f"💿 Saving updated data...")
-        final_data.to_csv(csv_file, index=False)
+        final_data.to_csv(tmp_file, index=False, date_format='%Y-%m-%d')
         
         # Verify the updated file
         print(f"🔍 Verifying updated file...")
-        is_valid, verification_msg = verify_csv_file(csv_file)
+        is_valid, verification_msg = verify_csv_file(tmp_file)
         
         if not is_valid:
             print(f"❌ Verification failed: {verification_msg}")
-            # Restore backup if verification fails
+            # The original CSV was never touched, so just discard the new file and the backup
+            os.remove(tmp_file)
             if os.path.exists(backup_file):
-                print(f"🔄 Restoring backup due to verification failure...")
-                os.remove(csv_file)
-                os.rename(backup_file, csv_file)
-                print(f"✅ Backup restored successfully")
+                os.remove(backup_file)
+            print(f"✅ Existing data left unchanged")
             return
         
         print(f"✅ Verification passed: {verification_msg}")
+        os.replace(tmp_file, csv_file)
+        
+        # Write the Parquet copy after the CSV so its newer timestamp marks it as current
+        parquet_file = get_parquet_file(csv_file)
+        print(f"💿 Saving Parquet copy: {os.path.basename(parquet_file)}")
+        # The copy is written to a temp file and swapped in, so a failed or interrupted write
+        # leaves the old copy in place, older than the CSV, and readers fall back to the CSV
+        parquet_data = final_data.astype({c: 'category' for c in CATEGORY_COLUMNS if c in final_data.columns})
+        if not write_parquet_copy(parquet_data, parquet_file):
+            print("⚠️  Parquet copy not updated; readers will use the CSV")
         
         # Report results
         new_rows = len(final_data)
@@ -234,8 +335,8 @@ def main():
         
         # Show date range of updated data
         if 'game_date' in final_data.columns:
-            min_date = final_data['game_date'].min()
-            max_date = final_data['game_date'].max()
+            min_date = final_data['game_date'].min().strftime('%Y-%m-%d')
+            max_date = final_data['game_date'].max().strftime('%Y-%m-%d')
             print(f"📅 Data now covers: {min_date} to {max_date}")
         
         print("🎉 Update completed successfully!")
@@ -264,13 +365,17 @@ def main():
         
     except Exception as e:
         print(f"❌ Error during update: {e}")
+        if 'tmp_file' in locals() and os.path.exists(tmp_file):
+            os.remove(tmp_file)
         # If there was an error and we created a backup, restore the most recent one
         # First check if current backup exists
         if 'backup_file' in locals() and os.path.exists(backup_file):
-            print(f"🔄 Restoring current backup: {os.path.basename(backup_file)}")
-            if os.path.exists(csv_file):
-                os.remove(csv_file)
-            os.rename(backup_file, csv_file)
+            if os.path.exists(csv_file) and os.path.samefile(backup_file, csv_file):
+                # The CSV was never replaced, so the backup is just a second link to it
+                os.remove(backup_file)
+            else:
+                print(f"🔄 Restoring current backup: {os.path.basename(backup_file)}")
+                os.replace(backup_file, csv_file)
         else:
             # Fall back to most recent timestamped backup
             backup_pattern = csv_file.replace('.csv', '_backup_*.csv')